@@ -7,35 +7,95 @@ import time
 import json
 import logging
 import signal
-import subprocess
-import feedparser
 import requests
-import datetime
+from requests.adapters import HTTPAdapter
 import re
+import copy
+import shutil
 import random
-import resource  # 添加resource库用于设置系统资源限制
+import itertools
 import gc  # 添加gc库用于主动垃圾回收
-import psutil  # 添加psutil库用于监控内存使用
+import tracemalloc  # 内存超限时定位分配最多的代码行
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from logging.handlers import RotatingFileHandler
-from bs4 import BeautifulSoup  # 添加BeautifulSoup库用于解析HTML
+import lxml.html  # 使用lxml直接解析HTML，比BeautifulSoup快得多
+from lxml.cssselect import CSSSelector
+from lxml.etree import XPath
 import cloudscraper  # 添加cloudscraper库用于绕过CloudFlare
 import threading  # 支持后台线程处理 Telegram 指令
 
 try:
-    import readline
+    import orjson  # 可选：比标准库json更快的JSON序列化库
 except ImportError:
-    pass
+    orjson = None
+
+try:
+    import ahocorasick  # 可选：使用Aho-Corasick自动机一次性匹配所有关键词
+except ImportError:
+    ahocorasick = None
+
 # 标志变量：是否需要重新获取 cookies（如首次访问或遭遇 Cloudflare 拦截）
 need_cookie_refresh = True
 # 全局 cloudscraper 实例，用于模拟浏览器绕过 Cloudflare，仅初始化一次以节省资源
 scraper = None
+# 帖子列表页面的缓存校验信息，用于条件请求（页面未变化时服务器返回304）；
+# 同时记录当时的配置版本，关键词等配置变化后需要重新解析页面，不再发送条件请求
+_last_etag = None
+_last_modified = None
+_validators_version = None
+# 收到终止信号时置位，监控循环在等待期间即可及时退出
+shutdown_event = threading.Event()
+# 垃圾回收统计：本次回收开始时间
+_gc_stats = {'start': 0.0}
+# 重启进行中时持有，防止重复重启
+_restart_lock = threading.Lock()
+# 内存泄漏检测：上次采样时各分配位置的(占用字节数, 内存块数)，以及各分配位置的[分配块数, 释放块数, 连续增长次数]；
+# 只保留按位置汇总的数据，不保留完整的tracemalloc快照
+_leak_tracker = {'sizes': {}, 'sites': {}}
+# 上一轮帖子列表中出现过的帖子（帖子ID，无法提取ID时为帖子链接），用于统计新出现的帖子数
+_previous_post_keys = None
+# Telegram 通知发送线程池，多个匹配的帖子并发发送通知；
+# 所有通知都发往同一个聊天，并发数过高容易触发Telegram的429限流，因此只用2个线程
+NOTIFY_WORKERS = 2
+NOTIFY_POOL = ThreadPoolExecutor(max_workers=NOTIFY_WORKERS)
+# 全局 Telegram 会话，复用 TCP/TLS 长连接，避免每次发送消息或轮询时重新握手；
+# 连接池需容纳所有发送线程外加一个getUpdates长轮询连接，否则多出的连接会被丢弃重建
+_tg_session = requests.Session()
+_tg_session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=NOTIFY_WORKERS + 1))
+_tg_session.headers.update({'Connection': 'keep-alive'})
+# 关键词匹配器缓存，仅在关键词列表变化时重建
+_keyword_matcher = {'keywords': None, 'casefolded': [], 'automaton': None, 'source': None, 'version': -1}
+# 缓存 Telegram API 地址，仅在 bot_token 变化（如重新加载配置）时重新生成
+_tg_url_cache = {'token': None, 'send': None, 'get_updates': None}
+# 开机自启状态缓存（检查时间, 结果），避免菜单每次刷新都调用systemctl
+_autostart_cache = {'checked_at': None, 'enabled': False}
+AUTOSTART_CACHE_TTL = 2.0  # 秒
+# 已加载的配置及对应配置文件的状态（inode、修改时间、大小），文件未变化时直接复用；
+# 每次加载或保存配置时递增版本号，关键词匹配器据此判断是否需要检查关键词变化
+_config_cache = {'key': None, 'config': None, 'version': 0}
 
 # 配置文件和日志文件路径
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE = os.path.join(BASE_DIR, 'config.json')
 LOG_FILE = os.path.join(BASE_DIR, 'monitor.log')
 PID_FILE = os.path.join(BASE_DIR, 'monitor.pid')
+POLL_STATE_FILE = os.path.join(BASE_DIR, 'poll_state.json')
+SESSION_STATE_FILE = os.path.join(BASE_DIR, 'session_state.json')
 SERVICE_FILE = '/etc/systemd/system/rss_monitor.service'
+# 查找后台监控进程时匹配命令行的模式：先精确匹配守护进程，再放宽到所有相关Python进程
+DAEMON_CMDLINE_PATTERN = re.compile(
+    rf'{re.escape(sys.executable)}.*{re.escape(os.path.basename(__file__))}.*--daemon')
+MONITOR_CMDLINE_PATTERN = re.compile(r'python.*rss_monitor')
+# Windows上用于重启监控进程的批处理脚本（延迟5秒后以相同参数重新启动）
+RESTART_BAT_FILE = os.path.join(BASE_DIR, 'restart.bat')
+RESTART_BAT_CONTENT = f'@echo off\ntimeout /t 5\n"{sys.executable}" "{sys.argv[0]}" {" ".join(sys.argv[1:])}'
+# 设置为1时启用tracemalloc内存分配跟踪的环境变量
+TRACEMALLOC_ENV = 'RSS_MONITOR_TRACEMALLOC'
+# 某个分配位置的泄漏分数超过阈值且连续多次内存检查时都在增长，才判定为内存泄漏
+LEAK_SCORE_THRESHOLD = 0.9
+LEAK_MIN_EVENTS = 3
+LEAK_MIN_SIZE = 1024 * 1024  # 占用不足1MB的位置即使持续增长也不足以导致内存超限
 
 # 日志配置
 log_handler = RotatingFileHandler(LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=1)
@@ -59,9 +119,115 @@ DEFAULT_CONFIG = {
     }
 }
 
+# NodeSeek 主页（用于获取 Cookie）与按发帖时间排序的帖子列表页
+NODESEEK_HOME_URL = "https://www.nodeseek.com"
+NODESEEK_LIST_URL = "https://www.nodeseek.com/?sortBy=postTime"
+# 抓取页面的超时时间（连接超时, 读取超时）
+SCRAPER_TIMEOUT = (5, 15)
+# 定期重启后，超过该时间（秒）的会话状态不再恢复
+SESSION_STATE_MAX_AGE = 600
+
+# 自适应检查间隔：保留的帖子到达间隔样本数，以及启用经验分布所需的最少样本数
+ARRIVAL_HISTORY = 500
+MIN_ARRIVAL_SAMPLES = 50
+
+# 历史记录保留上限
+MAX_NOTIFIED = 50  # 已通知帖子记录数
+MAX_TITLES = 100  # 已通知标题记录数
+
+# 配置文件序列化选项：缩进两格，允许非字符串键
+CONFIG_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if orjson is not None else None
+
+# 帖子列表候选选择器（根据NodeSeek网页结构调整），模块加载时预编译，每轮检查直接复用
+SELECTORS_TO_TRY = tuple((selector, CSSSelector(selector)) for selector in (
+    '.post-list .post-item',
+    '.post-card',
+    '.post-item',
+    '.category-post-item',
+    'article',
+    '.topic-item',
+    '.thread-item',
+    '.card',
+    '.topic-list .topic',  # 新增选择器
+    '.topic-list .topic-item',  # 新增选择器
+    '.topic-list tr',  # 新增选择器
+    '.row.topic-list-item',  # 新增选择器
+    '.node-teaser',  # 新增选择器
+    'tbody tr',  # 新增选择器
+    '.item',  # 更通用的选择器
+    '.list-item',  # 更通用的选择器
+    '.thread',  # 新增选择器
+    '.post',  # 新增选择器
+    'a.subject',  # 可能的标题链接
+    '[class*="post"]',  # 部分匹配class包含post的元素
+    '[class*="topic"]'  # 部分匹配class包含topic的元素
+))
+# 所有候选选择器的并集，一次查询即可判断是否有选择器可能命中
+SELECTORS_UNION = CSSSelector(', '.join(selector for selector, _ in SELECTORS_TO_TRY))
+
+# 帖子标题候选选择器
+TITLE_SELECTORS = tuple((selector, CSSSelector(selector)) for selector in (
+    'a.post-title', '.post-title', 'h3', 'h2', '.title', 'h4',
+    'a[href*="/post/"]', 'a[href*="/topic/"]', 'a[href*="/thread/"]',
+    'a.subject', '.subject', 'a.title', 'td.topic-title a',
+    'a[class*="title"]', '.topic-name a', '.thread-title a', 'a.thread-link',
+    'a'  # 最后尝试任何链接
+))
+
+# 帖子链接候选选择器
+LINK_SELECTORS = tuple((selector, CSSSelector(selector)) for selector in (
+    'a[href*="/post/"]', 'a[href*="/topic/"]', 'a[href*="/thread/"]',
+    'a[href*="/discussion/"]', 'a.subject', 'a.title', 'a[class*="title"]',
+    'a'  # 最后尝试任何链接
+))
+
+# 页面有效性检查、兜底查找帖子链接和表格行使用的选择器
+PAGE_LAYOUT_SELECTOR = CSSSelector('.navbar, header, footer')
+POST_LINK_SELECTOR = CSSSelector(
+    'a[href*="/post/"], a[href*="/topic/"], a[href*="/thread/"], a[href*="/discussion/"]')
+TABLE_ROW_SELECTOR = CSSSelector('table tr')
+# NodeSeek 页面为UTF-8编码，显式指定以免页面缺少charset声明时按Latin-1解析
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+# 兜底查找可能的帖子div：在前100个div中找出包含链接且文本超过20个字符的，最多40个
+XPATH_POTENTIAL_POSTS = XPath(
+    '(//div)[position() <= 100][.//a and string-length(normalize-space(.)) > 20][position() <= 40]')
+
+# 从链接中提取帖子ID的正则表达式
+POST_ID_COMBINED = re.compile(r'/(?:post|topic|thread|space|discussion)/(\d+)')
+# 帖子元素（含自身）中所有链接的href
+POST_HREFS = XPath('descendant-or-self::a/@href')
+
+
+def dump_json(obj, indent=False):
+    """将对象序列化为UTF-8编码的JSON字节（未安装orjson时使用标准库json）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=CONFIG_DUMP_OPTIONS if indent else None)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+def load_json(data):
+    """解析JSON字节（未安装orjson时使用标准库json）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def get_config_file_key():
+    """获取配置文件状态，用于判断文件是否被修改"""
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
 
 def load_config():
     """加载配置文件"""
+    # 配置文件自上次加载或保存后未被修改，直接返回内存中的配置，无需重新解析
+    file_key = get_config_file_key()
+    if file_key is not None and file_key == _config_cache['key']:
+        return _config_cache['config']
+
     # 尝试从主配置文件和备份文件加载配置
     config = None
     backup_file = CONFIG_FILE + '.bak'
@@ -69,10 +235,13 @@ def load_config():
     # 尝试从主配置文件加载
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(CONFIG_FILE, 'rb') as f:
+                config = load_json(f.read())
             logger.debug("从主配置文件加载配置成功")
-        except json.JSONDecodeError:
+            _config_cache['key'] = file_key
+            _config_cache['config'] = config
+            _config_cache['version'] += 1
+        except json.JSONDecodeError:  # orjson.JSONDecodeError也是其子类
             logger.error("主配置文件JSON格式错误")
             config = None
         except Exception as e:
@@ -83,8 +252,8 @@ def load_config():
     if config is None and os.path.exists(backup_file):
         try:
             logger.info("主配置文件加载失败，尝试从备份文件加载")
-            with open(backup_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(backup_file, 'rb') as f:
+                config = load_json(f.read())
             logger.info("从备份配置文件加载配置成功")
             # 如果从备份加载成功，则恢复到主配置文件
             save_config(config)
@@ -95,7 +264,8 @@ def load_config():
     # 如果都失败了，使用默认配置
     if config is None:
         logger.warning("无法加载配置文件，使用默认配置")
-        config = DEFAULT_CONFIG
+        # 配置会被缓存并原地修改，使用副本以免改动默认配置
+        config = copy.deepcopy(DEFAULT_CONFIG)
         save_config(config)
     else:
         # 确保配置中包含所有必要的键
@@ -113,6 +283,10 @@ def load_config():
             if 'chat_id' not in config['telegram']:
                 config['telegram']['chat_id'] = ''
 
+        # 历史记录按通知时间排列，之后只需在插入时淘汰最旧的记录
+        trim_records(get_notified_entries(config), MAX_NOTIFIED)
+        trim_records(get_title_notifications(config), MAX_TITLES)
+
     return config
 
 
@@ -120,40 +294,17 @@ def save_config(config):
     """保存配置文件"""
     # 定义备份文件路径
     backup_file = CONFIG_FILE + '.bak'
+    backup_temp_file = backup_file + '.tmp'
     temp_file = CONFIG_FILE + '.tmp'
 
     try:
-        # 检查配置对象大小，防止过大导致内存占用
-        # 对历史记录进行清理，防止配置文件无限增长
-        # 限制 notified_entries 记录数
-        if 'notified_entries' in config and len(config['notified_entries']) > 50:
-            # 按照时间排序，保留最新的50条
-            sorted_entries = sorted(
-                config['notified_entries'].items(),
-                key=lambda item: item[1]['time'] if isinstance(item[1], dict) and 'time' in item[1] else '',
-                reverse=True
-            )[:50]
-            config['notified_entries'] = dict(sorted_entries)
-            logger.debug("配置保存前已限制通知记录为50条")
-
-        # 限制 title_notifications 记录数
-        if 'title_notifications' in config and len(config['title_notifications']) > 100:
-            # 按照时间排序，保留最新的100条
-            sorted_titles = sorted(
-                config['title_notifications'].items(),
-                key=lambda item: item[1]['time'] if isinstance(item[1], dict) and 'time' in item[1] else '',
-                reverse=True
-            )[:100]
-            config['title_notifications'] = dict(sorted_titles)
-            logger.debug("配置保存前已限制标题记录为100条")
-
-        # 检查config对象是否有效且可序列化
+        # 历史记录在插入时已限制数量，这里直接检查config对象是否有效且可序列化
         try:
-            # 测试JSON序列化
-            config_str = json.dumps(config, ensure_ascii=False)
+            # 序列化一次，结果同时用于大小检查和写入文件
+            config_bytes = dump_json(config, indent=True)
             # 检查序列化后的配置文件大小，防止过大
-            if len(config_str) > 1024 * 1024:  # 如果大于1MB
-                logger.warning(f"配置文件过大 ({len(config_str) / 1024:.2f} KB)，尝试清理")
+            if len(config_bytes) > 1024 * 1024:  # 如果大于1MB
+                logger.warning(f"配置文件过大 ({len(config_bytes) / 1024:.2f} KB)，尝试清理")
 
                 # 保留基本配置，清理历史记录
                 basic_config = {
@@ -163,68 +314,84 @@ def save_config(config):
                     'title_notifications': {}
                 }
 
-                # 仅保留最新的少量记录
+                # 仅保留最新的少量记录（记录按通知时间排列，末尾为最新）
                 if 'notified_entries' in config and config['notified_entries']:
-                    sorted_entries = sorted(
-                        config['notified_entries'].items(),
-                        key=lambda item: item[1]['time'] if isinstance(item[1], dict) and 'time' in item[1] else '',
-                        reverse=True
-                    )[:20]  # 只保留最新的20条
-                    basic_config['notified_entries'] = dict(sorted_entries)
+                    basic_config['notified_entries'] = OrderedDict(
+                        list(config['notified_entries'].items())[-20:])  # 只保留最新的20条
 
                 if 'title_notifications' in config and config['title_notifications']:
-                    sorted_titles = sorted(
-                        config['title_notifications'].items(),
-                        key=lambda item: item[1]['time'] if isinstance(item[1], dict) and 'time' in item[1] else '',
-                        reverse=True
-                    )[:20]  # 只保留最新的20条
-                    basic_config['title_notifications'] = dict(sorted_titles)
+                    basic_config['title_notifications'] = OrderedDict(
+                        list(config['title_notifications'].items())[-20:])  # 只保留最新的20条
 
                 # 使用清理后的配置
                 config = basic_config
-                config_str = json.dumps(config, ensure_ascii=False)
-                logger.info(f"配置文件清理后大小: {len(config_str) / 1024:.2f} KB")
+                config_bytes = dump_json(config, indent=True)
+                logger.info(f"配置文件清理后大小: {len(config_bytes) / 1024:.2f} KB")
         except (TypeError, ValueError) as e:
             logger.error(f"配置对象序列化失败: {e}")
             # 如果序列化失败，回退到默认配置
-            config = DEFAULT_CONFIG
+            config = copy.deepcopy(DEFAULT_CONFIG)
+            config_bytes = dump_json(config, indent=True)
 
         # 先写入临时文件
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=4)
+        with open(temp_file, 'wb') as f:
+            f.write(config_bytes)
+            f.flush()
+            os.fsync(f.fileno())
 
         # 如果原配置文件存在，先创建备份
         if os.path.exists(CONFIG_FILE):
             try:
-                # 尝试复制原文件为备份
-                import shutil
-                shutil.copy2(CONFIG_FILE, backup_file)
+                # 使用硬链接保留原文件作为备份，只修改目录项而不复制文件内容，
+                # 且原配置文件始终存在，其他进程读取时不会扑空；
+                # 先链接到临时文件再替换旧备份，新备份创建成功前旧备份始终保留
+                if os.path.exists(backup_temp_file):
+                    os.remove(backup_temp_file)
+                try:
+                    os.link(CONFIG_FILE, backup_temp_file)
+                except OSError:
+                    # 不支持硬链接的文件系统（如部分Docker挂载目录、FAT/exFAT、网络共享）上改为复制
+                    shutil.copy2(CONFIG_FILE, backup_temp_file)
+                os.replace(backup_temp_file, backup_file)
             except Exception as e:
                 logger.warning(f"创建配置文件备份失败: {e}")
 
-        # 将临时文件重命名为正式配置文件
+        # 将临时文件重命名为正式配置文件（原子操作）
         os.replace(temp_file, CONFIG_FILE)
-
-        # 执行垃圾回收
-        gc.collect()
+        # 内存中的配置与刚写入的文件一致，后续加载可直接复用
+        _config_cache['key'] = get_config_file_key()
+        _config_cache['config'] = config
+        _config_cache['version'] += 1
     except Exception as e:
         logger.error(f"保存配置文件失败: {e}")
-        # 如果有备份，尝试从备份恢复
-        if os.path.exists(backup_file):
+        # 原子替换保证失败时原配置文件不受影响，仅在其缺失时从备份恢复
+        if not os.path.exists(CONFIG_FILE) and os.path.exists(backup_file):
             try:
-                # 尝试从备份恢复
-                import shutil
-                shutil.copy2(backup_file, CONFIG_FILE)
+                try:
+                    os.link(backup_file, CONFIG_FILE)
+                except OSError:
+                    shutil.copy2(backup_file, CONFIG_FILE)
                 logger.info("已从备份恢复配置文件")
             except Exception as e2:
                 logger.error(f"从备份恢复配置文件失败: {e2}")
     finally:
         # 清理可能残留的临时文件
-        if os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except Exception:
-                pass
+        for leftover_file in (temp_file, backup_temp_file):
+            if os.path.exists(leftover_file):
+                try:
+                    os.remove(leftover_file)
+                except Exception:
+                    pass
+
+
+def get_telegram_urls(bot_token):
+    """获取Telegram API地址（按bot_token缓存）"""
+    if _tg_url_cache['token'] != bot_token:
+        base_url = f"https://api.telegram.org/bot{bot_token}"
+        _tg_url_cache['send'] = base_url + "/sendMessage"
+        _tg_url_cache['get_updates'] = base_url + "/getUpdates"
+        _tg_url_cache['token'] = bot_token
+    return _tg_url_cache
 
 
 def send_telegram_message(message, config):
@@ -236,14 +403,29 @@ def send_telegram_message(message, config):
         logger.error("Telegram配置不完整")
         return False
 
+    # 正在停止时不再发送排队中的通知，视为发送失败，下次启动后会重新通知
+    if shutdown_event.is_set():
+        return False
+
     try:
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        data = {
+        url = get_telegram_urls(bot_token)['send']
+        # 使用JSON提交，避免对HTML消息正文进行urlencode
+        payload = {
             "chat_id": chat_id,
             "text": message,
             "parse_mode": "HTML"
         }
-        response = requests.post(url, data=data)
+        response = _tg_session.post(url, json=payload, timeout=10)
+        if response.status_code == 429:
+            # 被限流时按Telegram给出的等待时间重试一次
+            try:
+                retry_after = response.json()['parameters']['retry_after']
+            except (ValueError, KeyError, TypeError):
+                retry_after = 5
+            logger.warning(f"Telegram消息发送被限流，{retry_after}秒后重试")
+            if shutdown_event.wait(min(retry_after, 30)):
+                return False
+            response = _tg_session.post(url, json=payload, timeout=10)
         if response.status_code == 200:
             logger.info(f"Telegram消息发送成功")
             return True
@@ -262,28 +444,36 @@ def handle_telegram_commands(config):
         logger.error("无法启动Telegram命令监听：未设置bot_token或chat_id")
         return
 
-    url = f"https://api.telegram.org/bot{token}/getUpdates"
+    url = get_telegram_urls(token)['get_updates']
+    chat_id_str = str(chat_id)
     last_update_id = None
 
     while True:
         try:
-            response = requests.get(url, params={'offset': last_update_id, 'timeout': 30})
+            # 长轮询：服务端最多挂起30秒，客户端超时需大于该值
+            response = _tg_session.get(url, params={'offset': last_update_id, 'timeout': 30}, timeout=35)
             updates = response.json().get('result', [])
+            if not updates:
+                continue
+
+            # 重新加载配置，避免用旧的配置快照覆盖监控循环写入的通知记录
+            config = load_config()
+            replies = []
+            config_changed = False
             for update in updates:
                 last_update_id = update['update_id'] + 1
                 message = update.get('message', {})
                 text = message.get('text', '')
                 sender_id = str(message.get('chat', {}).get('id', ''))
 
-                if sender_id != str(chat_id):
+                if sender_id != chat_id_str:
                     continue
 
-                reply = ""
                 if text.startswith("/add "):
                     keyword = text[5:].strip()
                     if keyword and keyword not in config['keywords']:
                         config['keywords'].append(keyword)
-                        save_config(config)
+                        config_changed = True
                         reply = f"关键词 '{keyword}' 已添加"
                     else:
                         reply = "关键词已存在或为空"
@@ -291,7 +481,7 @@ def handle_telegram_commands(config):
                     keyword = text[5:].strip()
                     if keyword in config['keywords']:
                         config['keywords'].remove(keyword)
-                        save_config(config)
+                        config_changed = True
                         reply = f"关键词 '{keyword}' 已删除"
                     else:
                         reply = "关键词不存在"
@@ -302,26 +492,123 @@ def handle_telegram_commands(config):
                 else:
                     reply = "未知指令，请使用 /help 查看用法"
 
-                send_telegram_message(reply, config)
+                replies.append(reply)
+
+            # 整批指令处理完后统一保存一次配置，并合并为一条回复
+            if config_changed:
+                save_config(config)
+            if replies:
+                send_telegram_message("\n\n".join(replies), config)
 
         except Exception as e:
             logger.error(f"处理Telegram命令时出错: {e}")
             time.sleep(5)
 
 
+def match_keywords(title_cf, keywords):
+    """返回已casefold的标题中匹配到的关键词（不区分大小写，保持配置中的顺序）"""
+    # 关键词只会随配置加载或保存而改变，版本号和列表对象都未变时跳过逐个比较
+    if _keyword_matcher['version'] != _config_cache['version'] or _keyword_matcher['source'] is not keywords:
+        _keyword_matcher['version'] = _config_cache['version']
+        _keyword_matcher['source'] = keywords
+        keywords = tuple(keywords)
+        if _keyword_matcher['keywords'] != keywords:
+            rebuild_keyword_matcher(keywords)
+    keywords = _keyword_matcher['keywords']
+
+    automaton = _keyword_matcher['automaton']
+    if automaton is not None:
+        hits = set()
+        for _, indexes in automaton.iter(title_cf):
+            hits.update(indexes)
+        return [keywords[index] for index in sorted(hits)]
+    return [keywords[index] for index, keyword in enumerate(_keyword_matcher['casefolded']) if keyword in title_cf]
+
+
+def rebuild_keyword_matcher(keywords):
+    """根据关键词重建匹配器"""
+    casefolded = [keyword.casefold() for keyword in keywords]
+    automaton = None
+    if ahocorasick is not None:
+        # 同一casefold形式可能对应多个关键词，记录所有下标
+        words = {}
+        for index, keyword in enumerate(casefolded):
+            if keyword:
+                words.setdefault(keyword, []).append(index)
+        if words:
+            automaton = ahocorasick.Automaton()
+            for keyword, indexes in words.items():
+                automaton.add_word(keyword, indexes)
+            automaton.make_automaton()
+    _keyword_matcher['casefolded'] = casefolded
+    _keyword_matcher['automaton'] = automaton
+    _keyword_matcher['keywords'] = keywords
+
+
+def trim_records(records, limit):
+    """从最旧的一端淘汰记录，直到数量不超过limit"""
+    while len(records) > limit:
+        records.popitem(last=False)
+
+
+def get_notified_entries(config):
+    """将已通知记录整理为按通知时间排序的OrderedDict"""
+    records = config.get('notified_entries')
+    if isinstance(records, OrderedDict):
+        return records
+    if not isinstance(records, dict):
+        records = {}
+
+    config['notified_entries'] = OrderedDict(sorted(
+        records.items(),
+        key=lambda item: item[1]['time'] if isinstance(item[1], dict) and 'time' in item[1] else ''
+    ))
+    return config['notified_entries']
+
+
+def get_title_notifications(config):
+    """将标题通知记录整理为按通知时间排序的OrderedDict，并为旧记录补全时间戳"""
+    records = config.get('title_notifications')
+    if isinstance(records, OrderedDict):
+        return records
+    if not isinstance(records, dict):
+        records = {}
+
+    ordered = []
+    for t_key, t_data in records.items():
+        if not isinstance(t_data, dict):
+            continue
+        if 'ts' not in t_data:
+            try:
+                t_data['ts'] = time.mktime(time.strptime(t_data['time'], '%Y-%m-%d %H:%M:%S'))
+            except (KeyError, TypeError, ValueError):
+                # 丢弃无法解析时间的记录
+                continue
+        ordered.append((t_key, t_data))
+
+    ordered.sort(key=lambda item: item[1]['ts'])
+    config['title_notifications'] = OrderedDict(ordered)
+    return config['title_notifications']
+
+
+def select_one(element, selector):
+    """返回元素下第一个匹配预编译CSS选择器的节点，未找到时返回None"""
+    matches = selector(element)
+    return matches[0] if matches else None
+
+
 def check_rss_feed():
+    """检查网页并匹配关键词，返回与上一轮相比新出现的帖子数（无法判断时返回None，检查失败时返回False）"""
+    # 检查过程中的等待均可被终止信号打断，收到信号时放弃本次检查并返回None
     config = load_config()
-    """检查网页并匹配关键词"""
     # 确保config字典包含必要的键
     if 'keywords' not in config or not isinstance(config['keywords'], list):
         config['keywords'] = []
 
-    if 'notified_entries' not in config or not isinstance(config['notified_entries'], dict):
-        config['notified_entries'] = {}
+    notified_entries = get_notified_entries(config)
 
     # 添加标题-链接映射，用于跟踪已经发送通知的标题，防止重复通知
-    if 'title_notifications' not in config:
-        config['title_notifications'] = {}
+    title_notifications = get_title_notifications(config)
 
     if not config['keywords']:
         logger.warning("没有设置关键词，跳过检查")
@@ -338,23 +625,25 @@ def check_rss_feed():
             logger.info("尝试使用cloudscraper绕过CloudFlare防护...")
 
             # 创建一个cloudscraper实例，这是专门为绕过CloudFlare防护设计的
-            global scraper, need_cookie_refresh
+            global scraper, need_cookie_refresh, _last_etag, _last_modified, _validators_version, _previous_post_keys
 
             if scraper is None or need_cookie_refresh:
-                logger.info("创建新的 cloudscraper 实例并访问主页获取 Cookie...")
-                scraper = cloudscraper.create_scraper(
-                    browser={
-                        'browser': 'chrome',
-                        'platform': 'windows',
-                        'desktop': True
-                    },
-                    delay=5
-                )
+                if scraper is None:
+                    logger.info("创建 cloudscraper 实例并访问主页获取 Cookie...")
+                    scraper = create_scraper()
+                else:
+                    # 复用现有会话和连接，只清除旧Cookie后重新获取
+                    logger.info("清除旧 Cookie 并重新访问主页获取 Cookie...")
+                    scraper.cookies.clear()
+                    # 刷新Cookie说明之前的请求出了问题，下一次请求完整页面以确认能正常获取和解析
+                    _last_etag = None
+                    _last_modified = None
                 try:
-                    homepage_response = scraper.get("https://www.nodeseek.com", timeout=30)
+                    homepage_response = scraper.get(NODESEEK_HOME_URL, timeout=SCRAPER_TIMEOUT)
                     if homepage_response.status_code == 200:
                         logger.info("主页访问成功，Cookie 初始化完成")
-                        time.sleep(random.uniform(2, 4))
+                        if shutdown_event.wait(random.uniform(2, 4)):
+                            return None
                         need_cookie_refresh = False
                     else:
                         logger.warning(f"主页访问返回非 200 状态码: {homepage_response.status_code}")
@@ -362,18 +651,30 @@ def check_rss_feed():
                 except Exception as e:
                     logger.warning(f"访问主页失败: {e}")
                     need_cookie_refresh = True
-                    return  # 跳过本轮
+                    return False  # 跳过本轮
 
 
             # 随机延迟，模拟人类行为
             human_delay = random.uniform(3, 7)
             logger.info(f"模拟人类浏览行为，等待{human_delay:.2f}秒...")
-            time.sleep(human_delay)
+            if shutdown_event.wait(human_delay):
+                return None
 
             # 请求NodeSeek网页
             logger.info("请求帖子列表页面...")
-            response = scraper.get("https://www.nodeseek.com/?sortBy=postTime", timeout=30)
-            if response.status_code != 200 or 'Cloudflare' in response.text or 'captcha' in response.text.lower():
+            conditional_headers = {}
+            if _validators_version == _config_cache['version']:
+                if _last_etag:
+                    conditional_headers['If-None-Match'] = _last_etag
+                if _last_modified:
+                    conditional_headers['If-Modified-Since'] = _last_modified
+            response = scraper.get(NODESEEK_LIST_URL, headers=conditional_headers, timeout=SCRAPER_TIMEOUT)
+            if response.status_code == 304:
+                logger.info("帖子列表页面未变化 (304 Not Modified)，跳过本次解析")
+                return 0
+
+            html_content = response.content  # 直接使用原始字节，省去整页解码
+            if response.status_code != 200 or b'Cloudflare' in html_content or b'captcha' in html_content.lower():
                 logger.warning("帖子页面可能被 Cloudflare 拦截，将标记下次重新获取 Cookie")
                 need_cookie_refresh = True
                 continue  # 跳过本次处理
@@ -383,127 +684,99 @@ def check_rss_feed():
                 logger.error(f"获取网页失败，HTTP状态码: {response.status_code}")
 
                 # 尝试打印响应内容以便调试
-                logger.error(f"响应内容: {response.text[:500]}...")
+                logger.error("响应内容: %s...", html_content[:500].decode('utf-8', 'replace'))
 
                 if attempt < max_retries - 1:
                     # 增加失败后的等待时间
                     current_retry_delay = retry_delay * (attempt + 2)  # 进一步增加等待时间
                     logger.info(f"将在{current_retry_delay}秒后重试 ({attempt + 1}/{max_retries})")
-                    time.sleep(current_retry_delay)
+                    if shutdown_event.wait(current_retry_delay):
+                        return None
                     continue
-                return
-
-            # 使用BeautifulSoup解析HTML，使用lxml解析器以减少内存占用
-            html_content = response.text
-            response = None  # 释放response对象，减少内存占用
-
-            # 使用BeautifulSoup解析HTML之前先进行一次垃圾回收
-            gc.collect()
+                return False
 
-            # 使用内存效率更高的lxml解析器
-            soup = BeautifulSoup(html_content, 'lxml')
+            # 记录缓存校验信息，所有通知发送成功后再启用
+            page_etag = response.headers.get('ETag')
+            page_last_modified = response.headers.get('Last-Modified')
 
-            # 获取必要信息后释放原始HTML内容
+            # 使用lxml直接解析字节内容
+            response = None  # 释放response对象，减少内存占用
+            root = lxml.html.fromstring(html_content, parser=HTML_PARSER)
             html_content = None
-            gc.collect()  # 再次进行垃圾回收
 
             # 检查页面内容是否包含NodeSeek的典型内容
             is_valid_page = False
-            if soup.title:
-                logger.info(f"页面标题: {soup.title.text}")
-                if 'NodeSeek' in soup.title.text or '论坛' in soup.title.text:
+            page_title_element = root.find('.//title')
+            page_title = page_title_element.text_content() if page_title_element is not None else None
+            if page_title is not None:
+                logger.info(f"页面标题: {page_title}")
+                if 'NodeSeek' in page_title or '论坛' in page_title:
                     is_valid_page = True
 
             if not is_valid_page:
                 # 尝试查找页面上的关键元素来确认是否是有效的NodeSeek页面
-                if soup.select('.navbar') or soup.select('header') or soup.select('footer'):
+                if PAGE_LAYOUT_SELECTOR(root):
                     is_valid_page = True
 
             if not is_valid_page:
                 logger.error("获取到的页面似乎不是有效的NodeSeek页面，可能仍被CloudFlare拦截")
                 need_cookie_refresh = True
-                # 保存一部分页面内容以便分析（限制大小）
-                debug_content = str(soup)[:1000]  # 限制为1000字符
-                logger.debug(f"页面内容片段: {debug_content}")
+                # 保存一部分页面内容以便分析（限制大小），序列化整棵树开销较大，仅在DEBUG级别时进行
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("页面内容片段: %s", lxml.html.tostring(root, encoding='unicode')[:1000])
 
-                # 释放soup对象
-                soup = None
-                gc.collect()
+                # 释放解析树
+                root = None
 
                 if attempt < max_retries - 1:
                     current_retry_delay = retry_delay * (attempt + 2)
                     logger.info(f"将在{current_retry_delay}秒后重试 ({attempt + 1}/{max_retries})")
-                    time.sleep(current_retry_delay)
+                    if shutdown_event.wait(current_retry_delay):
+                        return None
                     continue
-                return
+                return False
 
             # 正常页面，开始查找帖子
             logger.info("成功获取NodeSeek页面，开始查找帖子...")
 
-            # 查找帖子列表（根据NodeSeek网页结构调整选择器）
-            # 尝试多种可能的CSS选择器
-            selectors_to_try = [
-                '.post-list .post-item',
-                '.post-card',
-                '.post-item',
-                '.category-post-item',
-                'article',
-                '.topic-item',
-                '.thread-item',
-                '.card',
-                '.topic-list .topic',  # 新增选择器
-                '.topic-list .topic-item',  # 新增选择器
-                '.topic-list tr',  # 新增选择器
-                '.row.topic-list-item',  # 新增选择器
-                '.node-teaser',  # 新增选择器
-                'tbody tr',  # 新增选择器
-                '.item',  # 更通用的选择器
-                '.list-item',  # 更通用的选择器
-                '.thread',  # 新增选择器
-                '.post',  # 新增选择器
-                'a.subject',  # 可能的标题链接
-                '[class*="post"]',  # 部分匹配class包含post的元素
-                '[class*="topic"]'  # 部分匹配class包含topic的元素
-            ]
-
+            # 查找帖子列表，尝试多种可能的CSS选择器
             post_items = []
 
-            # 优化查找过程，一旦找到符合条件的选择器就停止尝试
-            found_selector = None
-            for selector in selectors_to_try:
-                items = soup.select(selector)
-                if items and len(items) >= 5:  # 至少有5个项目才算有效
-                    logger.info(f"使用选择器 '{selector}' 找到了 {len(items)} 个元素")
-                    post_items = items[:40]  # 只处理前40个帖子
-                    found_selector = selector
-                    break
+            # 优先使用优先级最高的选择器，页面结构不变时只需查询一次
+            selector, compiled_selector = SELECTORS_TO_TRY[0]
+            items = compiled_selector(root)
+            if len(items) >= 5:  # 至少有5个项目才算有效
+                logger.info(f"使用选择器 '{selector}' 找到了 {len(items)} 个元素")
+                post_items = items[:40]  # 只处理前40个帖子
+            # 并集不足5个元素时任何单个选择器都不可能满足条件，直接跳过逐个尝试
+            elif len(SELECTORS_UNION(root)) >= 5:
+                # 一旦找到符合条件的选择器就停止尝试
+                for selector, compiled_selector in SELECTORS_TO_TRY[1:]:
+                    items = compiled_selector(root)
+                    if len(items) >= 5:  # 至少有5个项目才算有效
+                        logger.info(f"使用选择器 '{selector}' 找到了 {len(items)} 个元素")
+                        post_items = items[:40]  # 只处理前40个帖子
+                        break
 
             # 如果找不到帖子，获取页面HTML并记录下来以便分析
             if not post_items:
                 logger.info("常规选择器未找到帖子，尝试分析页面结构...")
 
                 # 保存页面的一些关键信息以帮助调试
-                logger.info(f"页面标题: {soup.title.text if soup.title else 'No title'}")
+                logger.info(f"页面标题: {page_title if page_title is not None else 'No title'}")
 
                 # 尝试查找任何包含链接的div元素
                 logger.info("尝试查找带有链接的div元素...")
-                potential_post_divs = []
-                for div in soup.find_all('div', limit=100):  # 限制搜索范围减少内存使用
-                    links = div.find_all('a', limit=5)
-                    if links and len(div.get_text(strip=True)) > 20:  # 确保div有一定的内容
-                        potential_post_divs.append(div)
-                        if len(potential_post_divs) >= 40:
-                            break  # 找到足够多的元素后停止
+                potential_post_divs = XPATH_POTENTIAL_POSTS(root)
 
                 if potential_post_divs:
                     logger.info(f"通过div+链接方式找到了 {len(potential_post_divs)} 个可能的帖子")
-                    post_items = potential_post_divs[:40]  # 只处理前40个帖子
+                    post_items = potential_post_divs
 
             # 如果还是找不到，尝试直接查找所有链接
             if not post_items:
                 logger.info("尝试直接查找所有链接...")
-                link_elements = soup.select(
-                    'a[href*="/post/"], a[href*="/topic/"], a[href*="/thread/"], a[href*="/discussion/"]', limit=40)
+                link_elements = POST_LINK_SELECTOR(root)[:40]
                 if link_elements:
                     logger.info(f"找到了 {len(link_elements)} 个可能的帖子链接")
                     # 直接使用链接元素作为帖子项
@@ -512,7 +785,7 @@ def check_rss_feed():
             # 如果以上方法都失败，尝试查找表格行
             if not post_items:
                 logger.info("尝试查找表格行...")
-                table_rows = soup.select('table tr', limit=40)
+                table_rows = TABLE_ROW_SELECTOR(root)[:40]
                 if table_rows and len(table_rows) > 1:  # 跳过表头
                     logger.info(f"找到了 {len(table_rows) - 1} 个表格行")
                     post_items = table_rows[1:40] if len(table_rows) > 40 else table_rows[1:]  # 跳过表头，限制数量
@@ -522,71 +795,83 @@ def check_rss_feed():
                 logger.error("无法在网页中找到帖子列表，可能网页结构已更改")
                 need_cookie_refresh = True
 
-                # 释放soup对象
-                soup = None
-                gc.collect()
+                # 释放解析树
+                root = None
 
                 if attempt < max_retries - 1:
                     current_retry_delay = retry_delay * (attempt + 2)
                     logger.info(f"将在{current_retry_delay}秒后重试 ({attempt + 1}/{max_retries})")
-                    time.sleep(current_retry_delay)
+                    if shutdown_event.wait(current_retry_delay):
+                        return None
                     continue
-                return
+                return False
 
             logger.info(f"成功获取帖子列表，共找到 {len(post_items)} 条帖子")
 
-            # 处理找到的帖子
-            processed_count = 0
+            # 处理找到的帖子，通知提交到线程池并发发送
+            pending_notifications = []
+            # 统计上一轮列表中没有出现过的帖子，按帖子标识比较，分类、标签等各帖子共有的链接不影响判断
+            current_post_keys = set()
+            new_post_count = 0
+
+            # 本轮检查统一使用同一时间戳
+            now_ts = int(time.time())
+            now_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now_ts))
+
+            # 清理超过24小时的标题记录（记录按时间排序，只需从最旧的一端弹出）
+            while title_notifications and next(iter(title_notifications.values()))['ts'] < now_ts - 86400:
+                title_notifications.popitem(last=False)
+
             for post in post_items:
                 try:
-                    # 每处理10个帖子进行一次垃圾回收，减少内存占用
-                    processed_count += 1
-                    if processed_count % 10 == 0:
-                        gc.collect()
+                    post_hrefs = [href for href in POST_HREFS(post) if '/space/' not in href]
+
+                    # 先从原始链接中提取帖子ID，全部已通知过时直接跳过，省去标题和链接的提取
+                    raw_post_ids = set()
+                    for href in post_hrefs:
+                        match = POST_ID_COMBINED.search(href)
+                        if match:
+                            raw_post_ids.add(match.group(1))
+                    post_keys = {f"post_{post_id}" for post_id in raw_post_ids}
+                    current_post_keys.update(post_keys)
+                    if (_previous_post_keys is not None and post_keys
+                            and post_keys.isdisjoint(_previous_post_keys)):
+                        new_post_count += 1
+                    if raw_post_ids and all(f"post_{post_id}" in notified_entries for post_id in raw_post_ids):
+                        logger.debug(f"跳过已通知过的帖子ID: {', '.join(sorted(raw_post_ids))}")
+                        continue
 
                     # 尝试多种可能的标题选择器
                     title_element = None
-                    title_selectors = [
-                        'a.post-title', '.post-title', 'h3', 'h2', '.title', 'h4',
-                        'a[href*="/post/"]', 'a[href*="/topic/"]', 'a[href*="/thread/"]',
-                        'a.subject', '.subject', 'a.title', 'td.topic-title a',
-                        'a[class*="title"]', '.topic-name a', '.thread-title a', 'a.thread-link',
-                        'a'  # 最后尝试任何链接
-                    ]
-
-                    for selector in title_selectors:
-                        title_element = post.select_one(selector)
-                        if title_element:
+                    for selector, compiled_selector in TITLE_SELECTORS:
+                        title_element = select_one(post, compiled_selector)
+                        if title_element is not None:
                             logger.debug(f"使用选择器 '{selector}' 找到了标题元素")
                             break
 
                     # 如果没有找到标题元素但post本身是链接，则使用post作为标题元素
-                    if not title_element and post.name == 'a':
+                    if title_element is None and post.tag == 'a':
                         title_element = post
                         logger.debug("帖子本身是链接，直接使用")
 
                     # 如果仍然没有找到标题元素，尝试查找任何链接
-                    if not title_element:
-                        links = post.find_all('a', limit=3)  # 限制搜索数量
-                        if links:
-                            # 使用第一个链接作为标题元素
-                            title_element = links[0]
+                    if title_element is None:
+                        # 使用第一个链接作为标题元素
+                        title_element = post.find('.//a')
+                        if title_element is not None:
                             logger.debug("使用第一个链接作为标题")
 
-                    if not title_element:
+                    if title_element is None:
                         logger.warning("无法解析帖子的标题元素")
                         continue
 
                     # 提取标题文本
-                    if hasattr(title_element, 'get_text'):
-                        title = title_element.get_text(strip=True)
-                    else:
-                        title = str(title_element).strip()
+                    title = title_element.text_content().strip()
 
                     # 如果标题为空，尝试其他方法
                     if not title:
                         # 尝试获取任何文本内容
-                        title = post.get_text(strip=True)
+                        title = post.text_content().strip()
                         logger.debug(f"使用帖子完整文本作为标题: {title[:30]}...")
 
                         # 如果内容太长，取前50个字符
@@ -602,21 +887,15 @@ def check_rss_feed():
                     link = None
 
                     # 如果标题元素有href属性，直接获取
-                    if hasattr(title_element, 'get') and title_element.get('href'):
+                    if title_element.get('href'):
                         link = title_element.get('href')
                         logger.debug(f"从标题元素获取链接: {link}")
 
                     # 如果没有获取到链接，尝试在帖子中查找链接
                     if not link:
-                        link_selectors = [
-                            'a[href*="/post/"]', 'a[href*="/topic/"]', 'a[href*="/thread/"]',
-                            'a[href*="/discussion/"]', 'a.subject', 'a.title', 'a[class*="title"]',
-                            'a'  # 最后尝试任何链接
-                        ]
-
-                        for selector in link_selectors:
-                            link_element = post.select_one(selector)
-                            if link_element and link_element.get('href'):
+                        for selector, compiled_selector in LINK_SELECTORS:
+                            link_element = select_one(post, compiled_selector)
+                            if link_element is not None and link_element.get('href'):
                                 link = link_element.get('href')
                                 logger.debug(f"使用选择器 '{selector}' 找到链接: {link}")
                                 break
@@ -624,9 +903,9 @@ def check_rss_feed():
                     # 如果链接是相对路径，转换为绝对URL
                     if link and not link.startswith('http'):
                         if link.startswith('/'):
-                            link = 'https://www.nodeseek.com' + link
+                            link = NODESEEK_HOME_URL + link
                         else:
-                            link = 'https://www.nodeseek.com/' + link
+                            link = NODESEEK_HOME_URL + '/' + link
                         logger.debug(f"转换为绝对URL: {link}")
 
                     if not link:
@@ -642,134 +921,110 @@ def check_rss_feed():
                     logger.debug(f"帖子标题='{title}', 链接={link}")
 
                     # 提取帖子ID，用于唯一性判断
-                    post_id = None
-                    post_id_patterns = [
-                        r'/post/(\d+)',
-                        r'/topic/(\d+)',
-                        r'/thread/(\d+)',
-                        r'/space/(\d+)',
-                        r'/discussion/(\d+)'
-                    ]
-
-                    for pattern in post_id_patterns:
-                        match = re.search(pattern, link)
-                        if match:
-                            post_id = match.group(1)
-                            break
+                    match = POST_ID_COMBINED.search(link)
+                    post_id = match.group(1) if match else None
 
                     # 生成唯一ID（优先使用帖子ID，如果没有则使用完整链接）
                     entry_id = f"post_{post_id}" if post_id else link
 
+                    # 原始链接中没有帖子ID时，以解析出的帖子链接作为帖子标识
+                    if not post_keys:
+                        current_post_keys.add(entry_id)
+                        if _previous_post_keys is not None and entry_id not in _previous_post_keys:
+                            new_post_count += 1
+
                     # 检查标题是否已经通知过(无论链接如何)
-                    normalized_title = title.lower().strip()
-                    current_time = datetime.datetime.now()
-                    # 清理超过24小时的标题记录
-                    title_cleanup = []
-                    for t_key, t_data in config.get('title_notifications', {}).items():
-                        last_time = datetime.datetime.strptime(t_data['time'], '%Y-%m-%d %H:%M:%S')
-                        if (current_time - last_time).total_seconds() > 86400:  # 24小时
-                            title_cleanup.append(t_key)
-
-                    for t_key in title_cleanup:
-                        if t_key in config['title_notifications']:
-                            del config['title_notifications'][t_key]
-
-                    # 检查是否有相似标题已经通知过
-                    title_already_notified = False
-                    for t_key, t_data in config.get('title_notifications', {}).items():
-                        # 标题相似度检查 - 如果标题完全相同或者包含关系
-                        if normalized_title == t_key or normalized_title in t_key or t_key in normalized_title:
-                            # 检查时间是否在2小时内
-                            last_time = datetime.datetime.strptime(t_data['time'], '%Y-%m-%d %H:%M:%S')
-                            if (current_time - last_time).total_seconds() < 7200:  # 2小时内
-                                logger.debug(f"跳过已通知过的相似标题: {title}, 原标题: {t_data['title']}")
-                                title_already_notified = True
+                    title_cf = title.casefold()  # 每个帖子只做一次大小写归一化
+                    normalized_title = title_cf.strip()
+
+                    # 检查是否有相似标题已经通知过（2小时内）：先精确匹配，未命中再检查包含关系
+                    similar_title = title_notifications.get(normalized_title)
+                    if similar_title is None or now_ts - similar_title['ts'] >= 7200:
+                        similar_title = None
+                        for t_key, t_data in title_notifications.items():
+                            if (normalized_title in t_key or t_key in normalized_title) and now_ts - t_data['ts'] < 7200:
+                                similar_title = t_data
                                 break
 
-                    if title_already_notified:
+                    if similar_title is not None:
+                        logger.debug(f"跳过已通知过的相似标题: {title}, 原标题: {similar_title['title']}")
                         continue
 
                     # 检查是否在ID列表中
-                    if entry_id in config['notified_entries']:
+                    if entry_id in notified_entries:
                         logger.debug(f"跳过已通知过的帖子ID: {entry_id}")
                         continue
 
                     # 匹配关键词
-                    matched_keywords = []
-                    for keyword in config['keywords']:
-                        if keyword.lower() in title.lower():
-                            matched_keywords.append(keyword)
+                    matched_keywords = match_keywords(title_cf, config['keywords'])
 
                     if matched_keywords:
                         # 记录到标题通知历史
-                        config['title_notifications'][normalized_title] = {
+                        title_notifications[normalized_title] = {
                             'title': title,
                             'link': link,
-                            'time': current_time.strftime('%Y-%m-%d %H:%M:%S')
+                            'time': now_str,
+                            'ts': now_ts
                         }
+                        title_notifications.move_to_end(normalized_title)
+                        trim_records(title_notifications, MAX_TITLES)
 
                         # 记录到已通知列表（只保存必要信息）
-                        config['notified_entries'][entry_id] = {
+                        notified_entries[entry_id] = {
                             'title': title,
                             'link': link,
                             'keywords': matched_keywords,
-                            'time': current_time.strftime('%Y-%m-%d %H:%M:%S')
+                            'time': now_str,
+                            'ts': now_ts
                         }
+                        trim_records(notified_entries, MAX_NOTIFIED)
 
                         # 标记配置已更改
                         config_changed = True
 
                         # 发送Telegram通知
                         message = f"<b>NodeSeek 网页监控 检测到关键词匹配！</b>\n\n关键词: {', '.join(matched_keywords)}\n标题: {title}\n链接: {link}"
-                        if send_telegram_message(message, config):
-                            logger.info(f"检测到关键词 '{', '.join(matched_keywords)}' 在帖子 '{title}' 并成功发送通知")
-                        else:
-                            logger.error(f"发送通知失败，帖子标题: {title}")
-                            # 如果发送失败，从已通知列表中移除
-                            if entry_id in config['notified_entries']:
-                                del config['notified_entries'][entry_id]
+                        future = NOTIFY_POOL.submit(send_telegram_message, message, config)
+                        pending_notifications.append((future, entry_id, normalized_title, title, matched_keywords))
                 except Exception as e:
                     logger.error(f"处理帖子时出错: {str(e)}")
                     continue
 
-            # 释放soup对象
-            soup = None
+            # 等待所有通知发送完成后再确定需要保存的记录
+            wait([future for future, _, _, _, _ in pending_notifications])
+            all_sent = True
+            for future, entry_id, normalized_title, title, matched_keywords in pending_notifications:
+                if future.result():
+                    logger.info(f"检测到关键词 '{', '.join(matched_keywords)}' 在帖子 '{title}' 并成功发送通知")
+                else:
+                    all_sent = False
+                    logger.error(f"发送通知失败，帖子标题: {title}")
+                    # 如果发送失败，从已通知列表和标题通知历史中移除，下次检查时重新通知
+                    if entry_id in notified_entries:
+                        del notified_entries[entry_id]
+                    title_notifications.pop(normalized_title, None)
+
+            # 释放解析树
+            root = None
             post_items = None
-            gc.collect()
-
-            # 限制notified_entries的数量为最新的50条
-            if len(config['notified_entries']) > 50:
-                # 按照时间排序，保留最新的50条
-                sorted_entries = sorted(
-                    config['notified_entries'].items(),
-                    key=lambda item: item[1]['time'],
-                    reverse=True
-                )[:50]
-
-                # 更新为只包含最新50条的字典
-                config['notified_entries'] = dict(sorted_entries)
-                logger.info(f"已限制记录数量为50条")
-                config_changed = True
-
-            # 限制title_notifications的数量
-            if len(config.get('title_notifications', {})) > 100:
-                # 按照时间排序，保留最新的100条
-                sorted_titles = sorted(
-                    config['title_notifications'].items(),
-                    key=lambda item: item[1]['time'],
-                    reverse=True
-                )[:100]
-
-                # 更新为只包含最新100条的字典
-                config['title_notifications'] = dict(sorted_titles)
-                logger.info(f"已限制标题记录数量为100条")
-                config_changed = True
 
             # 只有在配置有变更时才保存配置
             if config_changed:
                 save_config(config)
 
-            return  # 成功完成，退出函数
+            # 所有通知都发送成功时才启用缓存校验信息；有通知发送失败时清除，
+            # 否则页面未变化时服务器返回304，下次检查无法重新发送通知
+            if all_sent:
+                _last_etag = page_etag
+                _last_modified = page_last_modified
+            else:
+                _last_etag = None
+                _last_modified = None
+            _validators_version = _config_cache['version']
+
+            is_first_list = _previous_post_keys is None
+            _previous_post_keys = current_post_keys
+            return None if is_first_list else new_post_count  # 成功完成，退出函数
 
         except cloudscraper.exceptions.CloudflareException as e:
             logger.error(f"CloudScraper错误: {str(e)}")
@@ -788,7 +1043,8 @@ def check_rss_feed():
             if attempt < max_retries - 1:
                 recovery_delay = retry_delay * 3
                 logger.info(f"内存溢出后恢复中，将在{recovery_delay}秒后重试")
-                time.sleep(recovery_delay)
+                if shutdown_event.wait(recovery_delay):
+                    return None
         except Exception as e:
             logger.error(f"检查网页时出错: {str(e)} (尝试 {attempt + 1}/{max_retries})")
             need_cookie_refresh = True
@@ -798,15 +1054,300 @@ def check_rss_feed():
             # 增加失败后的等待时间
             current_retry_delay = retry_delay * (attempt + 2)
             logger.info(f"将在{current_retry_delay}秒后重试 ({attempt + 1}/{max_retries})")
-            time.sleep(current_retry_delay)
+            if shutdown_event.wait(current_retry_delay):
+                return None
+
+    # 所有尝试均失败（出错或被Cloudflare拦截）
+    return False
+
+
+def create_scraper(cipher_suite=None):
+    """创建cloudscraper实例"""
+    new_scraper = cloudscraper.create_scraper(
+        browser={
+            'browser': 'chrome',
+            'platform': 'windows',
+            'desktop': True
+        },
+        delay=5
+    )
+    if cipher_suite:
+        new_scraper.cipherSuite = cipher_suite
+    # 只访问单一站点，用较小的连接池替换默认适配器（保留cloudscraper的TLS加密套件设置），
+    # 连接在多次检查之间保持复用
+    new_scraper.mount('https://', cloudscraper.CipherSuiteAdapter(
+        cipherSuite=new_scraper.cipherSuite,
+        ecdhCurve=new_scraper.ecdhCurve,
+        server_hostname=new_scraper.server_hostname,
+        source_address=new_scraper.source_address,
+        pool_connections=2,
+        pool_maxsize=4
+    ))
+    return new_scraper
+
+
+def save_session_state():
+    """保存抓取会话状态（浏览器标识、Cookie、缓存校验信息等），供定期重启后恢复"""
+    if scraper is None or need_cookie_refresh:
+        return
+    state = {
+        'saved_at': time.time(),
+        'headers': dict(scraper.headers),
+        'cipher_suite': scraper.cipherSuite,
+        'cookies': [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+             'expires': c.expires, 'secure': c.secure}
+            for c in scraper.cookies
+        ],
+        # 配置在记录缓存校验信息后有变化时，重启后也需要重新解析页面
+        'etag': _last_etag if _validators_version == _config_cache['version'] else None,
+        'last_modified': _last_modified if _validators_version == _config_cache['version'] else None,
+        'previous_post_keys': list(_previous_post_keys) if _previous_post_keys is not None else None
+    }
+    try:
+        # 文件中包含Cookie，仅允许当前用户读写
+        fd = os.open(SESSION_STATE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dump_json(state))
+    except OSError as e:
+        logger.warning(f"保存会话状态失败: {e}")
+
+
+def restore_session_state():
+    """恢复定期重启前保存的抓取会话状态，恢复后删除状态文件"""
+    global scraper, need_cookie_refresh, _last_etag, _last_modified, _validators_version, _previous_post_keys
+
+    try:
+        with open(SESSION_STATE_FILE, 'rb') as f:
+            state = load_json(f.read())
+        os.remove(SESSION_STATE_FILE)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        logger.warning(f"读取会话状态失败: {e}")
+        return
+
+    try:
+        if time.time() - state['saved_at'] > SESSION_STATE_MAX_AGE:
+            logger.info("会话状态已过期，不再恢复")
+            return
+        restored = create_scraper(state['cipher_suite'])
+        restored.headers.update(state['headers'])
+        for cookie in state['cookies']:
+            restored.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'],
+                                 expires=cookie['expires'], secure=cookie['secure'])
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"会话状态无效: {e}")
+        return
+
+    scraper = restored
+    need_cookie_refresh = False
+    _last_etag = state.get('etag')
+    _last_modified = state.get('last_modified')
+    # 重启后配置版本号重新计数，缓存校验信息对应刚加载的配置
+    _validators_version = _config_cache['version']
+    if state.get('previous_post_keys') is not None:
+        _previous_post_keys = set(state['previous_post_keys'])
+    logger.info("已恢复重启前的会话状态")
+
+
+def load_poll_state():
+    """加载帖子到达间隔样本和最近一次发现新帖的时间（进程重启后继续使用）"""
+    try:
+        with open(POLL_STATE_FILE, 'rb') as f:
+            state = load_json(f.read())
+        return deque(state.get('arrival_deltas', []), maxlen=ARRIVAL_HISTORY), state.get('last_arrival')
+    except (OSError, ValueError, AttributeError):
+        return deque(maxlen=ARRIVAL_HISTORY), None
+
+
+def save_poll_state(arrival_deltas, last_arrival):
+    """保存帖子到达间隔样本和最近一次发现新帖的时间"""
+    try:
+        with open(POLL_STATE_FILE, 'wb') as f:
+            f.write(dump_json({'arrival_deltas': list(arrival_deltas), 'last_arrival': last_arrival}))
+    except OSError as e:
+        logger.warning(f"保存轮询状态失败: {e}")
+
+
+def next_poll_delay(last_new_post_age, arrival_deltas, min_delay, max_delay, polls_per_hour, jitter=1.0):
+    """根据帖子到达间隔的经验分布计算下次检查前的等待秒数
+
+    按递推式 L_i = F(L_{i-1}) / p(L_{i-1}) + L_{i-1} 安排检查时刻，其中L为距最近一次新帖的时间，
+    p为到达间隔的概率密度（按1秒分桶并做滑动窗口平滑），F为其累积分布。样本不足时使用[0, U]上的均匀先验。
+    结果限制在[下限, U]之间：下限取min_delay与每小时检查次数预算对应间隔中的较大者，
+    U取到达间隔的99分位数（不超过max_delay）。随机抖动系数jitter在限制范围之前乘到递推结果上。
+    """
+    floor = max(min_delay, 3600 / polls_per_hour)
+    if len(arrival_deltas) < MIN_ARRIVAL_SAMPLES:
+        upper = max_delay
+        # 均匀先验下 F(t) / p(t) = t
+        step = last_new_post_age
+    else:
+        samples = sorted(arrival_deltas)
+        upper = min(max(samples[int(0.99 * (len(samples) - 1))], floor), max_delay)
+        bins = int(upper) + 1
+        counts = [1] * bins  # 拉普拉斯平滑，避免概率密度为0
+        for delta in samples:
+            if delta < bins:
+                counts[int(delta)] += 1
+        cdf = list(itertools.accumulate(counts))
+        age_bin = min(int(last_new_post_age), bins - 1)
+        # 用前后各5秒窗口内的平均计数估计概率密度，减少样本稀疏带来的抖动
+        low, high = max(age_bin - 5, 0), min(age_bin + 5, bins - 1)
+        density = (cdf[high] - (cdf[low - 1] if low > 0 else 0)) / (high - low + 1)
+        # F和p的归一化系数相同，直接用计数相除
+        step = cdf[age_bin] / density
+    return min(max(step * jitter, floor), upper)
+
+
+def get_rss_bytes():
+    """获取当前进程实际物理内存使用（字节）"""
+    import psutil  # 仅在需要精确内存数据时导入
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+def update_leak_scores(statistics):
+    """对比相邻两次采样时各分配位置的内存占用，更新泄漏分数，返回持续增长的位置"""
+    previous = _leak_tracker['sizes']
+    current = {}
+    for stat in statistics:
+        frame = stat.traceback[0]
+        current[(frame.filename, frame.lineno)] = (stat.size, stat.count)
+    _leak_tracker['sizes'] = current
+    if not previous:
+        return []
+
+    sites = _leak_tracker['sites']
+    leaking = []
+    for site, (size, count) in current.items():
+        previous_size, previous_count = previous.get(site, (0, 0))
+        record = sites.setdefault(site, [0, 0, 0])
+        if count > previous_count:
+            record[0] += count - previous_count
+        else:
+            record[1] += previous_count - count
+        # 拉普拉斯平滑：分配的内存块几乎都未被释放时分数接近1
+        score = (record[0] - record[1] + 1) / (record[0] + 2)
+        if size > previous_size and score > LEAK_SCORE_THRESHOLD:
+            record[2] += 1
+        else:
+            record[2] = 0
+        if record[2] >= LEAK_MIN_EVENTS and size >= LEAK_MIN_SIZE:
+            leaking.append((site, score, size))
+    # 已不再占用内存的位置不再跟踪
+    for site in list(sites):
+        if site not in current:
+            del sites[site]
+    return leaking
+
+
+def check_memory_leaks(log_top=False, limit=10):
+    """采样各分配位置的内存占用并根据泄漏分数判断是否存在内存泄漏，log_top为True时记录分配内存最多的代码行"""
+    if not tracemalloc.is_tracing():
+        if log_top:
+            logger.info(f"未启用tracemalloc，设置环境变量 {TRACEMALLOC_ENV}=1 后可记录内存分配来源并检测泄漏")
+        return False
+    snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+    statistics = snapshot.statistics('lineno')
+    snapshot = None  # 只保留按位置汇总的统计，尽快释放快照
+    if log_top:
+        logger.warning(f"内存分配最多的 {limit} 处代码:")
+        for stat in statistics[:limit]:
+            logger.warning(f"  {stat}")
+
+    leaking = update_leak_scores(statistics)
+    for (filename, lineno), score, size in leaking:
+        logger.error(f"疑似内存泄漏: {filename}:{lineno} 连续{LEAK_MIN_EVENTS}次以上增长，"
+                     f"泄漏分数{score:.2f}，当前占用{size / 1024:.1f} KB")
+    return bool(leaking)
+
+
+def write_pid_file(pid):
+    """写入PID文件"""
+    # 直接写入文件描述符并同步到磁盘，确保停止进程时能读到完整的PID
+    fd = os.open(PID_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, str(pid).encode())
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def restart_process(reason):
+    """重启监控进程（Linux使用execv，Windows通过批处理脚本），失败时返回"""
+    # 正在停止时不再重启
+    if shutdown_event.is_set():
+        logger.info(f"收到终止信号，取消重启（原因: {reason}）")
+        return
+    # 同一时间只允许一次重启，避免多处同时触发
+    if not _restart_lock.acquire(blocking=False):
+        logger.warning(f"重启已在进行中，忽略本次重启请求（原因: {reason}）")
+        return
+    logger.info(f"准备重启监控进程，原因: {reason}")
+    # 保存会话状态，重启后继续使用当前Cookie和缓存校验信息
+    save_session_state()
+
+    try:
+        if os.name == 'nt':  # Windows
+            logger.info("Windows系统上通过创建批处理文件重启进程")
+            with open(RESTART_BAT_FILE, 'w') as f:
+                f.write(RESTART_BAT_CONTENT)
+            # 使用subprocess启动，不等待结果（start是cmd内置命令，需要经过shell）
+            import subprocess
+            subprocess.Popen(['start', RESTART_BAT_FILE], shell=True)
+            logger.info(f"已创建重启脚本: {RESTART_BAT_FILE}")
+        else:  # Linux
+            logger.info("Linux系统上使用execv重启进程")
+            if os.path.exists(PID_FILE):
+                os.remove(PID_FILE)
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+    except Exception as e:
+        logger.error(f"重启监控进程失败: {e}")
+        # 进程继续运行，恢复可能已删除的PID文件，以免被误认为已停止而启动第二个监控进程
+        try:
+            write_pid_file(os.getpid())
+        except OSError as e2:
+            logger.error(f"恢复PID文件失败: {e2}")
+        _restart_lock.release()
+        return
+
+    # Windows上由批处理脚本启动新进程，清理并退出当前进程
+    if os.path.exists(PID_FILE):
+        os.remove(PID_FILE)
+    sys.exit(0)  # 正常退出当前进程
+
+
+def gc_callback(phase, info):
+    """记录完整垃圾回收的耗时"""
+    if phase == 'start':
+        _gc_stats['start'] = time.perf_counter()
+    elif info['generation'] == 2:
+        elapsed = (time.perf_counter() - _gc_stats['start']) * 1000
+        logger.debug(f"完整垃圾回收完成，回收{info['collected']}个对象，耗时{elapsed:.2f}ms")
 
 
 def monitor_loop():
     """监控循环"""
     logger.info("开始网页监控")
 
+    # 调高分代回收阈值，降低完整回收频率（默认700, 10, 10），不再周期性手动回收
+    gc.set_threshold(50000, 20, 20)
+    gc.callbacks.append(gc_callback)
+
+    # resource（设置系统资源限制）与psutil（监控内存使用）仅监控循环需要，在此按需导入
+    try:
+        import resource
+    except ImportError:  # Windows系统上没有resource库
+        resource = None
+
+    # 按环境变量开启tracemalloc，用于内存超限时定位泄漏来源（有一定性能开销）
+    if os.environ.get(TRACEMALLOC_ENV) == '1' and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        logger.info("已启用tracemalloc内存分配跟踪")
+
     # 尝试增加系统文件描述符限制（仅Linux系统）
-    if os.name != 'nt' and 'resource' in sys.modules:
+    if resource is not None:
         try:
             soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
             logger.info(f"当前文件描述符限制: 软限制={soft}, 硬限制={hard}")
@@ -821,15 +1362,25 @@ def monitor_loop():
     else:
         logger.info("在Windows系统上运行，跳过文件描述符限制设置")
 
+    # 收到SIGTERM时不直接终止进程，而是结束等待并正常退出循环（以便清理PID文件）
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown_event.set())
+
     # 记录PID到文件，以便其他进程可以检测到监控正在运行
-    with open(PID_FILE, 'w') as f:
-        f.write(str(os.getpid()))
+    write_pid_file(os.getpid())
 
     # 设置检查间隔（秒）
     min_interval = 30  # 最小间隔30秒
-    max_interval = 40  # 最大间隔40秒
+    max_interval = 40  # 与最小间隔之比作为随机抖动的最大倍数（最多放大到40/30倍）
+    max_poll_interval = 300  # 长时间没有新帖时最多间隔5分钟
+    max_polls_per_hour = 120  # 每小时最多检查次数
     consecutive_errors = 0
     max_consecutive_errors = 5
+    # 出错后的退避等待时间（秒），按去相关抖动的指数退避增长，成功后复位
+    error_backoff = min_interval
+    max_error_backoff = 3600  # 最长等待1小时
+
+    # 帖子到达间隔样本，用于按发帖规律自适应调整检查间隔
+    arrival_deltas, last_arrival = load_poll_state()
 
     # 错误计数器，用于自适应调整检查间隔
     error_stats = {
@@ -838,16 +1389,15 @@ def monitor_loop():
         'last_success': time.time()
     }
 
-    # 加载初始配置
-    config = load_config()
-    # 设置配置重新加载计数器
-    reload_counter = 0
+    # 加载初始配置（之后每次检查时加载配置，文件未修改则直接复用内存中的配置）
+    load_config()
+    # 恢复定期重启前的抓取会话状态（需在加载配置之后，缓存校验信息与当前配置版本对应）
+    restore_session_state()
+    # 循环计数器：每5次循环检查内存
+    loop_n = 0
 
     # 内存监控变量
-    gc_counter = 0  # 垃圾回收计数器
-    memory_check_counter = 0  # 内存检查计数器
     memory_threshold = 200 * 1024 * 1024  # 内存阈值（200MB）
-    last_gc_time = time.time()  # 上次垃圾回收时间
 
     # 添加检测计数器，用于在检测10次后重启进程
     detection_counter = 0
@@ -855,112 +1405,88 @@ def monitor_loop():
 
     try:
         while True:
+            loop_n += 1
+            check_failed = False
             try:
-                # 定期进行垃圾回收（每10次循环）
-                gc_counter += 1
-                if gc_counter >= 10:
-                    logger.debug("执行周期性垃圾回收...")
-                    gc.collect()
-                    gc_counter = 0
-                    last_gc_time = time.time()
-
                 # 内存使用监控（每5次循环）
-                memory_check_counter += 1
-                if memory_check_counter >= 5:
+                if loop_n % 5 == 0:
                     try:
-                        process = psutil.Process(os.getpid())
-                        memory_info = process.memory_info()
-                        memory_usage = memory_info.rss  # 实际物理内存使用
-
-                        logger.debug(f"当前内存使用: {memory_usage / (1024 * 1024):.2f} MB")
-
+                        if resource is not None:
+                            # 峰值物理内存只需一次系统调用（Linux单位为KB，macOS为字节）
+                            peak_usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                            if sys.platform != 'darwin':
+                                peak_usage *= 1024
+                            logger.debug(f"峰值内存使用: {peak_usage / (1024 * 1024):.2f} MB")
+                        else:
+                            peak_usage = None
+
+                        # 峰值未超过阈值时当前内存必然也未超过，无需进一步检查
+                        memory_usage = 0
+                        if peak_usage is None or peak_usage > memory_threshold:
+                            memory_usage = get_rss_bytes()  # 实际物理内存使用
+                            logger.debug(f"当前内存使用: {memory_usage / (1024 * 1024):.2f} MB")
+
+                        # 启用tracemalloc时每次内存检查都采样，泄漏分数需要多次采样才能累积；
+                        # 确有持续增长的分配位置时提前重启，内存超限时同时记录分配最多的代码行以定位来源
+                        over_threshold = memory_usage > memory_threshold
+                        if check_memory_leaks(log_top=over_threshold):
+                            restart_process("检测到内存泄漏")
                         # 如果内存使用超过阈值，强制进行垃圾回收
-                        if memory_usage > memory_threshold:
+                        elif over_threshold:
                             logger.warning(
                                 f"内存使用超过阈值 ({memory_usage / (1024 * 1024):.2f} MB > {memory_threshold / (1024 * 1024)} MB)，执行强制垃圾回收")
                             # 执行完整的垃圾回收
                             gc.collect(2)
 
                             # 检查垃圾回收后的内存使用
-                            new_memory_info = process.memory_info()
-                            new_memory_usage = new_memory_info.rss
+                            new_memory_usage = get_rss_bytes()
 
+                            # tracemalloc看不到lxml、OpenSSL等原生库的内存，因此始终按内存使用判断是否重启
                             # 如果垃圾回收后内存仍然过高，可能存在内存泄漏
                             if new_memory_usage > memory_threshold * 0.9:  # 如果仍然超过阈值的90%
                                 logger.error(
-                                    f"垃圾回收后内存使用仍然过高 ({new_memory_usage / (1024 * 1024):.2f} MB)，可能存在内存泄漏，尝试重启监控进程")
-                                # 重启进程 - 区分Windows和Linux
-                                if os.name == 'nt':  # Windows
-                                    logger.info("Windows系统上不支持直接重启进程，建议手动重启程序")
-                                    # 可以考虑在Windows上使用其他方式重启
-                                    # 例如创建一个bat文件然后执行
-                                    restart_cmd = f'@echo off\ntimeout /t 5\n"{sys.executable}" "{sys.argv[0]}" {" ".join(sys.argv[1:])}'
-                                    restart_bat = os.path.join(BASE_DIR, 'restart.bat')
-                                    try:
-                                        with open(restart_bat, 'w') as f:
-                                            f.write(restart_cmd)
-                                        # 使用subprocess启动，不等待结果
-                                        subprocess.Popen(['start', restart_bat], shell=True)
-                                        logger.info(f"已创建重启脚本: {restart_bat}")
-                                        # 清理当前进程
-                                        if os.path.exists(PID_FILE):
-                                            os.remove(PID_FILE)
-                                        sys.exit(0)  # 正常退出当前进程
-                                    except Exception as e:
-                                        logger.error(f"创建重启脚本失败: {e}")
-                                else:  # Linux
-                                    # 使用execv重启进程
-                                    os.execv(sys.executable, [sys.executable] + sys.argv)
+                                    f"垃圾回收后内存使用仍然过高 ({new_memory_usage / (1024 * 1024):.2f} MB)，可能存在内存泄漏")
+                                restart_process("垃圾回收后内存仍超过阈值")
                     except Exception as e:
                         logger.error(f"内存监控出错: {e}")
 
-                    memory_check_counter = 0
-
-                # 只有在每10次循环或出错后才重新加载配置
-                if reload_counter >= 10:
-                    config = load_config()
-                    reload_counter = 0
+                new_post_count = check_rss_feed()
+                if shutdown_event.is_set():
+                    logger.info("收到终止信号，监控停止")
+                    break
+                if new_post_count is False:
+                    # 重试均失败或被Cloudflare拦截，按出错处理并退避
+                    check_failed = True
+                    consecutive_errors += 1
+                    error_stats['total_errors'] += 1
+                    logger.error("检查网页失败（重试次数已用尽或被拦截）")
                 else:
-                    reload_counter += 1
-
-                check_rss_feed()
-                consecutive_errors = 0  # 重置错误计数
-                error_stats['last_success'] = time.time()  # 记录上次成功时间
-
-                # 增加检测计数器
-                detection_counter += 1
-                logger.info(f"完成第 {detection_counter}/{max_detection_count} 次检测")
-
-                # 如果达到10次检测，重启进程
-                if detection_counter >= max_detection_count:
-                    logger.info(f"已完成 {max_detection_count} 次检测，准备重启进程...")
-
-                    # 重启进程 - 区分Windows和Linux
-                    if os.name == 'nt':  # Windows
-                        logger.info("Windows系统上通过创建批处理文件重启进程")
-                        restart_cmd = f'@echo off\ntimeout /t 5\n"{sys.executable}" "{sys.argv[0]}" {" ".join(sys.argv[1:])}'
-                        restart_bat = os.path.join(BASE_DIR, 'restart.bat')
-                        try:
-                            with open(restart_bat, 'w') as f:
-                                f.write(restart_cmd)
-                            # 使用subprocess启动，不等待结果
-                            subprocess.Popen(['start', restart_bat], shell=True)
-                            logger.info(f"已创建重启脚本: {restart_bat}")
-                            # 清理当前进程
-                            if os.path.exists(PID_FILE):
-                                os.remove(PID_FILE)
-                            sys.exit(0)  # 正常退出当前进程
-                        except Exception as e:
-                            logger.error(f"创建重启脚本失败: {e}")
-                            # 重置计数器，继续运行
-                            detection_counter = 0
-                    else:  # Linux
-                        logger.info("Linux系统上使用execv重启进程")
-                        # 使用execv重启进程
-                        if os.path.exists(PID_FILE):
-                            os.remove(PID_FILE)
-                        os.execv(sys.executable, [sys.executable] + sys.argv)
+                    if new_post_count:
+                        now = time.time()
+                        if last_arrival is not None:
+                            # 同一轮发现的多个新帖平均分摊到达间隔
+                            arrival_deltas.extend([(now - last_arrival) / new_post_count] * new_post_count)
+                        last_arrival = now
+                        save_poll_state(arrival_deltas, last_arrival)
+                    consecutive_errors = 0  # 重置错误计数
+                    error_backoff = min_interval  # 重置退避时间
+                    error_stats['last_success'] = time.time()  # 记录上次成功时间
+
+                    # 增加检测计数器
+                    detection_counter += 1
+                    logger.info(f"完成第 {detection_counter}/{max_detection_count} 次检测")
+
+                    # 如果达到10次检测，重启进程
+                    if detection_counter >= max_detection_count:
+                        if tracemalloc.is_tracing():
+                            # 重启会清空泄漏分数，定期重启时进程存活期间的采样次数不足以判定泄漏
+                            logger.info("已启用tracemalloc，跳过定期重启以便持续累积内存泄漏分数")
+                        else:
+                            restart_process(f"已完成 {max_detection_count} 次检测")
+                        # 跳过重启或重启失败时重置计数器，继续运行
+                        detection_counter = 0
             except Exception as e:
+                check_failed = True
                 error_msg = str(e)
                 consecutive_errors += 1
                 error_stats['total_errors'] += 1
@@ -971,69 +1497,57 @@ def monitor_loop():
                     logger.error(f"CloudFlare相关错误: {e}")
                 elif 'Too many open files' in error_msg:
                     logger.error(f"文件描述符耗尽错误: {e}")
-                    # 文件描述符耗尽时，强制进行垃圾回收
-                    gc.collect()
                     # 等待系统释放资源
-                    time.sleep(30)
-                    # 重置计数器，强制下次重新加载配置
-                    reload_counter = 10
+                    shutdown_event.wait(30)
                 # 添加内存错误处理
                 elif 'MemoryError' in error_msg or 'memory' in error_msg.lower():
                     logger.error(f"可能的内存相关错误: {e}")
                     # 执行完整的垃圾回收
                     gc.collect(2)
                     # 睡眠一段时间让系统恢复
-                    time.sleep(30)
-                    # 如果超过一小时没有进行过垃圾回收，可能是内存泄漏，尝试重启进程
-                    if time.time() - last_gc_time > 3600:  # 1小时
-                        logger.error("可能存在内存泄漏，尝试重启监控进程")
-                        # 区分Windows和Linux重启方式
-                        if os.name == 'nt':  # Windows
-                            logger.info("Windows系统上不支持直接重启进程，建议手动重启程序")
-                            # 同样创建bat脚本重启
-                            restart_cmd = f'@echo off\ntimeout /t 5\n"{sys.executable}" "{sys.argv[0]}" {" ".join(sys.argv[1:])}'
-                            restart_bat = os.path.join(BASE_DIR, 'restart.bat')
-                            try:
-                                with open(restart_bat, 'w') as f:
-                                    f.write(restart_cmd)
-                                # 使用subprocess启动，不等待结果
-                                subprocess.Popen(['start', restart_bat], shell=True)
-                                logger.info(f"已创建重启脚本: {restart_bat}")
-                                # 清理当前进程
-                                if os.path.exists(PID_FILE):
-                                    os.remove(PID_FILE)
-                                sys.exit(0)  # 正常退出当前进程
-                            except Exception as e:
-                                logger.error(f"创建重启脚本失败: {e}")
-                        else:  # Linux
-                            # 使用execv重启进程
-                            os.execv(sys.executable, [sys.executable] + sys.argv)
+                    shutdown_event.wait(30)
+                    # 确有持续增长的分配位置，或垃圾回收后内存仍然过高时重启进程
+                    if check_memory_leaks(log_top=True):
+                        restart_process("内存错误后检测到内存泄漏")
+                    else:
+                        try:
+                            memory_usage = get_rss_bytes()
+                        except Exception as e2:
+                            logger.error(f"获取内存使用失败: {e2}")
+                        else:
+                            if memory_usage > memory_threshold * 0.9:
+                                logger.error(f"内存错误后内存使用仍然过高 ({memory_usage / (1024 * 1024):.2f} MB)")
+                                restart_process("内存错误后内存仍超过阈值")
                 else:
                     logger.error(f"监控循环异常: {e}")
 
-                # 如果连续错误次数过多，增加检查间隔
+            if check_failed:
+                # 如果连续错误次数过多，记录警告
                 if consecutive_errors >= max_consecutive_errors:
                     logger.warning(f"连续出现{consecutive_errors}次错误，增加检查间隔")
 
-                    # 立即进行长时间等待
-                    long_wait = max_interval * 2
-                    logger.info(f"等待{long_wait}秒后恢复检查...")
-                    time.sleep(long_wait)
-                    consecutive_errors = 0  # 重置错误计数
-                    # 强制下次重新加载配置
-                    reload_counter = 10
-                    continue
+                # 指数退避（去相关抖动）：每次等待时间在[最小间隔, 上次等待的3倍]之间随机选取，
+                # 持续出错时逐步拉长，避免故障期间反复请求
+                error_backoff = min(max_error_backoff, random.uniform(min_interval, error_backoff * 3))
+                logger.info(f"等待{error_backoff:.2f}秒后恢复检查...")
+                if shutdown_event.wait(timeout=error_backoff):
+                    logger.info("收到终止信号，监控停止")
+                    break
+                continue
 
-            # 生成随机等待时间
-            check_interval = random.uniform(min_interval, max_interval)
+            # 根据发帖规律计算等待时间，并保留随机抖动模拟人类行为（抖动后仍不超过上限）
+            last_new_post_age = time.time() - last_arrival if last_arrival is not None else 0
+            check_interval = next_poll_delay(last_new_post_age, arrival_deltas, min_interval,
+                                             max_poll_interval, max_polls_per_hour,
+                                             random.uniform(1, max_interval / min_interval))
 
-            # 记录等待时间和下次检查时间点
-            next_check_time = datetime.datetime.now() + datetime.timedelta(seconds=check_interval)
-            logger.info(
-                f"等待{check_interval:.2f}秒后进行下一次检查 (预计时间: {next_check_time.strftime('%H:%M:%S')})")
+            # 记录等待时间（日志本身带有时间戳，无需再计算下次检查的具体时间）
+            logger.info(f"等待{check_interval:.2f}秒后进行下一次检查 (+{int(check_interval)}s)")
 
-            # 正常等待下一次检查
-            time.sleep(check_interval)
+            # 正常等待下一次检查，收到终止信号时立即退出
+            if shutdown_event.wait(timeout=check_interval):
+                logger.info("收到终止信号，监控停止")
+                break
     except KeyboardInterrupt:
         logger.info("监控被用户中断")
     except Exception as e:
@@ -1044,6 +1558,16 @@ def monitor_loop():
             os.remove(PID_FILE)
 
 
+def is_zombie(pid):
+    """判断进程是否为僵尸进程（仅Linux，读取/proc失败时返回False）"""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            # 格式为 "pid (进程名) 状态 ..."，进程名可能包含空格，取最后一个右括号之后的字段
+            return f.read().rpartition(')')[2].split()[0] == 'Z'
+    except (OSError, IndexError):
+        return False
+
+
 def is_monitoring_running():
     """检查监控进程是否在运行"""
     if os.path.exists(PID_FILE):
@@ -1051,8 +1575,10 @@ def is_monitoring_running():
             with open(PID_FILE, 'r') as f:
                 pid = int(f.read().strip())
 
-            # 检查进程是否存在
+            # 检查进程是否存在（已退出但未被回收的僵尸进程视为不存在）
             os.kill(pid, 0)
+            if is_zombie(pid):
+                raise ProcessLookupError(pid)
             return True
         except (ProcessLookupError, ValueError, FileNotFoundError):
             # 进程不存在或PID文件内容无效
@@ -1062,8 +1588,58 @@ def is_monitoring_running():
     return False
 
 
+def find_monitor_pids(pattern):
+    """查找命令行匹配指定模式的进程ID（不包括当前进程）"""
+    import psutil  # 仅在查找进程时需要
+    own_pid = os.getpid()
+    pids = []
+    for proc in psutil.process_iter(['pid', 'cmdline']):
+        cmdline = proc.info['cmdline']
+        if cmdline and proc.info['pid'] != own_pid and pattern.search(' '.join(cmdline)):
+            pids.append(proc.info['pid'])
+    return pids
+
+
+def signal_and_wait(pid, sig, timeout):
+    """向进程发送信号并等待其退出，返回进程是否已退出"""
+    import select
+
+    # 在发送信号前打开pidfd（Linux 5.3+），进程退出时变为可读，无需轮询，也不会受PID复用影响
+    try:
+        pidfd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return True
+    except (AttributeError, OSError):
+        pidfd = None  # 系统不支持pidfd_open，改为轮询
+
+    try:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            return True
+
+        if pidfd is not None:
+            readable, _, _ = select.select([pidfd], [], [], timeout)
+            return bool(readable)
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.5)
+            try:
+                # 检查进程是否还在运行
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return True
+        return False
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+
 def start_background_monitor():
     """在后台启动监控"""
+    import subprocess
+
     if is_monitoring_running():
         print("监控已经在后台运行中")
         return False
@@ -1076,10 +1652,31 @@ def start_background_monitor():
     if not config['keywords']:
         print("警告: 没有设置关键词，监控将不会有任何通知")
 
+    def spawn_daemon():
+        # 在新会话中启动后台进程（相当于nohup），不经过shell
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--daemon'],
+                                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL, start_new_session=True)
+        write_pid_file(process.pid)
+
     try:
-        # 使用nohup启动后台进程
-        cmd = f"nohup {sys.executable} {__file__} --daemon > /dev/null 2>&1 & echo $! > {PID_FILE}"
-        subprocess.run(cmd, shell=True)
+        if hasattr(os, 'fork'):
+            # 通过立即退出的中间进程启动，后台进程由init接管，
+            # 避免其退出后成为菜单进程的僵尸进程（僵尸进程仍会被os.kill(pid, 0)视为存在）
+            child = os.fork()
+            if child == 0:
+                exit_code = 1
+                try:
+                    spawn_daemon()
+                    exit_code = 0
+                finally:
+                    os._exit(exit_code)
+            _, status = os.waitpid(child, 0)
+            if status != 0:
+                raise RuntimeError("中间进程启动后台进程失败")
+        else:
+            # Windows没有僵尸进程问题，直接启动
+            spawn_daemon()
         print("监控已在后台启动")
         logger.info("监控在后台启动")
         return True
@@ -1091,6 +1688,8 @@ def start_background_monitor():
 
 def stop_background_monitor():
     """停止后台监控"""
+    import subprocess
+
     pid = None
     found_process = False
 
@@ -1098,8 +1697,7 @@ def stop_background_monitor():
     is_systemd_service = False
     try:
         # 检查服务是否正在运行
-        systemd_check_cmd = "systemctl is-active rss_monitor.service"
-        result = subprocess.run(systemd_check_cmd, shell=True, capture_output=True, text=True)
+        result = subprocess.run(["systemctl", "is-active", "rss_monitor.service"], capture_output=True, text=True)
         if result.stdout.strip() == "active":
             is_systemd_service = True
             logger.info("检测到通过systemd服务启动的监控进程")
@@ -1108,13 +1706,12 @@ def stop_background_monitor():
             # 尝试停止systemd服务
             try:
                 print("正在停止systemd服务...")
-                stop_cmd = "systemctl stop rss_monitor.service"
-                subprocess.run(stop_cmd, shell=True)
+                subprocess.run(["systemctl", "stop", "rss_monitor.service"])
 
                 # 验证服务是否已停止
                 time.sleep(2)  # 给一些时间让服务停止
-                verify_cmd = "systemctl is-active rss_monitor.service"
-                verify_result = subprocess.run(verify_cmd, shell=True, capture_output=True, text=True)
+                verify_result = subprocess.run(["systemctl", "is-active", "rss_monitor.service"],
+                                               capture_output=True, text=True)
 
                 if verify_result.stdout.strip() != "active":
                     logger.info("systemd服务已成功停止")
@@ -1134,57 +1731,40 @@ def stop_background_monitor():
             except Exception as e:
                 logger.error(f"停止systemd服务时出错: {e}")
                 print(f"停止systemd服务时出错: {e}")
+    except FileNotFoundError:
+        logger.debug("系统中没有systemctl命令，跳过systemd服务检查")
     except Exception as e:
         logger.error(f"检查systemd服务状态时出错: {e}")
 
-    # 方法1：通过PID文件获取进程ID
+    # 方法1：通过PID文件获取进程ID，并确认进程仍然存在
     if os.path.exists(PID_FILE):
         try:
             with open(PID_FILE, 'r') as f:
                 pid = int(f.read().strip())
-                found_process = True
             logger.debug(f"从PID文件中读取到进程ID: {pid}")
+            os.kill(pid, 0)
+            found_process = True
+        except ProcessLookupError:
+            logger.warning(f"PID文件中的进程 {pid} 已不存在")
+            pid = None
         except (ValueError, FileNotFoundError) as e:
             logger.error(f"读取PID文件时出错: {e}")
 
     if not found_process:
         print("PID文件不存在或无效，尝试查找运行中的监控进程...")
 
-        # 方法2：尝试使用ps命令查找进程
-        try:
-            cmd = f"ps aux | grep '{sys.executable}.*{os.path.basename(__file__)}.*--daemon' | grep -v grep"
-            logger.info(f"执行命令: {cmd}")
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if result.stdout.strip():
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) > 1:
-                        pid = int(parts[1])
-                        found_process = True
-                        logger.info(f"通过ps命令找到进程ID: {pid}")
-                        break
-        except Exception as e:
-            logger.error(f"使用ps命令查找进程时出错: {e}")
-
-    if not found_process:
-        # 方法3：尝试查找包含rss_monitor的所有Python进程
-        try:
-            print("尝试查找所有监控相关进程...")
-            cmd = f"ps aux | grep python | grep 'rss_monitor' | grep -v grep"
-            logger.info(f"执行命令: {cmd}")
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if result.stdout.strip():
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) > 1:
-                        pid = int(parts[1])
-                        found_process = True
-                        logger.info(f"通过扩展ps命令找到进程ID: {pid}")
-                        break
-        except Exception as e:
-            logger.error(f"使用扩展ps命令查找进程时出错: {e}")
+        # 方法2：按命令行查找守护进程，找不到时再查找包含rss_monitor的所有Python进程
+        for pattern, desc in ((DAEMON_CMDLINE_PATTERN, "守护进程"), (MONITOR_CMDLINE_PATTERN, "相关Python进程")):
+            try:
+                pids = find_monitor_pids(pattern)
+            except Exception as e:
+                logger.error(f"查找{desc}时出错: {e}")
+                continue
+            if pids:
+                pid = pids[0]
+                found_process = True
+                logger.info(f"通过进程列表找到{desc}ID: {pid}")
+                break
 
     if not found_process:
         print("没有找到运行中的监控进程")
@@ -1198,88 +1778,50 @@ def stop_background_monitor():
     # 使用kill命令终止进程
     if pid:
         try:
-            # 首先尝试使用SIGTERM信号终止进程
+            # 首先尝试使用SIGTERM信号终止进程，最多等待10秒
             logger.info(f"正在尝试使用SIGTERM终止进程 PID: {pid}")
-            os.kill(pid, signal.SIGTERM)
-
-            # 等待进程终止，最多等待10秒
-            max_wait = 20  # 最多等待20秒(40次*0.5秒)
-            for i in range(max_wait):
-                time.sleep(0.5)
-                try:
-                    # 检查进程是否还在运行
-                    os.kill(pid, 0)
-                    # 如果能执行到这里，表示进程还在运行
-                    if i % 4 == 0:  # 每2秒输出一次等待信息
-                        print(f"等待进程终止... ({i // 2 + 1}/{max_wait // 2}秒)")
-                except ProcessLookupError:
-                    # 进程已经终止
-                    success = True
-                    logger.info(f"进程 {pid} 已成功终止")
-                    break
-                except Exception as e:
-                    logger.error(f"检查进程状态时出错: {e}")
-                    break
+            print("等待进程终止...")
+            if signal_and_wait(pid, signal.SIGTERM, 10):
+                success = True
+                logger.info(f"进程 {pid} 已成功终止")
 
             # 如果SIGTERM没有效果，尝试SIGKILL
             if not success:
                 logger.warning(f"SIGTERM信号无效，尝试使用SIGKILL强制终止进程 PID: {pid}")
                 try:
-                    os.kill(pid, signal.SIGKILL)
-
-                    # 再次等待确认进程终止
-                    for i in range(10):  # 最多等待5秒
-                        time.sleep(0.5)
-                        try:
-                            os.kill(pid, 0)
-                            # 进程仍在运行
-                        except ProcessLookupError:
-                            # 进程已终止
-                            success = True
-                            logger.info(f"进程 {pid} 已通过SIGKILL成功终止")
-                            break
-                except ProcessLookupError:
-                    # 进程已经终止
-                    success = True
-                    logger.info(f"进程 {pid} 已终止")
+                    # 再次等待确认进程终止，最多等待5秒
+                    if signal_and_wait(pid, signal.SIGKILL, 5):
+                        success = True
+                        logger.info(f"进程 {pid} 已通过SIGKILL成功终止")
                 except Exception as e:
                     logger.error(f"发送SIGKILL信号时出错: {e}")
         except Exception as e:
             logger.error(f"尝试终止进程时出错: {e}")
 
-    # 如果前面的方法都失败，尝试使用pkill命令
+    # 如果前面的方法都失败，强制终止所有匹配的进程
     if not success:
-        logger.warning("标准终止方法失败，尝试使用pkill命令...")
+        logger.warning("标准终止方法失败，尝试强制终止所有相关进程...")
         try:
-            # 使用pkill强制终止所有相关进程
-            print("尝试使用pkill命令强制终止所有相关进程...")
-            pkill_cmd = f"pkill -9 -f '{os.path.basename(__file__)} --daemon'"
-            logger.info(f"执行命令: {pkill_cmd}")
-            subprocess.run(pkill_cmd, shell=True)
-            time.sleep(2)  # 给进程一些时间终止
-
-            # 验证进程是否终止
-            check_cmd = f"pgrep -f '{os.path.basename(__file__)} --daemon'"
-            result = subprocess.run(check_cmd, shell=True, capture_output=True)
-            if result.returncode != 0:  # 没有找到进程，表示已终止
-                success = True
-                logger.info("进程已通过pkill成功终止")
-            else:
-                # 最后手段，尝试终止所有Python进程中包含rss_monitor的进程
-                print("尝试终止所有相关Python进程...")
-                pkill_cmd = f"pkill -9 -f 'python.*rss_monitor'"
-                logger.info(f"执行命令: {pkill_cmd}")
-                subprocess.run(pkill_cmd, shell=True)
-                time.sleep(2)
-
-                # 再次检查
-                check_cmd = f"pgrep -f 'python.*rss_monitor'"
-                result = subprocess.run(check_cmd, shell=True, capture_output=True)
-                if result.returncode != 0:
+            import psutil
+            print("尝试强制终止所有相关进程...")
+            # 先终止守护进程，仍未成功时再终止所有包含rss_monitor的Python进程
+            for pattern, desc in ((DAEMON_CMDLINE_PATTERN, "守护进程"), (MONITOR_CMDLINE_PATTERN, "相关Python进程")):
+                procs = []
+                for match_pid in find_monitor_pids(pattern):
+                    try:
+                        proc = psutil.Process(match_pid)
+                        proc.kill()
+                        procs.append(proc)
+                    except psutil.NoSuchProcess:
+                        pass
+                # 给进程一些时间终止
+                _, alive = psutil.wait_procs(procs, timeout=2)
+                if not alive:
                     success = True
-                    logger.info("所有相关Python进程已终止")
+                    logger.info(f"所有{desc}已终止")
+                    break
         except Exception as e:
-            logger.error(f"使用pkill终止进程时出错: {e}")
+            logger.error(f"强制终止进程时出错: {e}")
 
     # 清理PID文件
     if os.path.exists(PID_FILE):
@@ -1301,6 +1843,11 @@ def stop_background_monitor():
 
 def setup_autostart(enable=True):
     """设置开机自启"""
+    import subprocess
+
+    # 自启状态即将改变，使缓存失效
+    _autostart_cache['checked_at'] = None
+
     config = load_config()
     if enable and (not config['telegram']['bot_token'] or not config['telegram']['chat_id']):
         print("错误: 请先配置Telegram设置")
@@ -1326,14 +1873,14 @@ WantedBy=multi-user.target
             with open(SERVICE_FILE, 'w') as f:
                 f.write(service_content)
 
-            subprocess.run("systemctl daemon-reload", shell=True)
-            subprocess.run("systemctl enable rss_monitor", shell=True)
+            subprocess.run(["systemctl", "daemon-reload"])
+            subprocess.run(["systemctl", "enable", "rss_monitor"])
             print("已启用开机自启")
             logger.info("已启用开机自启")
             return True
         else:
             if os.path.exists(SERVICE_FILE):
-                subprocess.run("systemctl disable rss_monitor", shell=True)
+                subprocess.run(["systemctl", "disable", "rss_monitor"])
                 os.remove(SERVICE_FILE)
                 print("已禁用开机自启")
                 logger.info("已禁用开机自启")
@@ -1532,13 +2079,27 @@ def setup_telegram():
 
 def is_autostart_enabled():
     """检查开机自启是否已启用"""
-    return os.path.exists(SERVICE_FILE) and subprocess.run("systemctl is-enabled rss_monitor", shell=True,
-                                                           stdout=subprocess.PIPE,
-                                                           stderr=subprocess.PIPE).returncode == 0
+    import subprocess
+
+    checked_at = _autostart_cache['checked_at']
+    if checked_at is not None and time.monotonic() - checked_at < AUTOSTART_CACHE_TTL:
+        return _autostart_cache['enabled']
+
+    enabled = os.path.exists(SERVICE_FILE) and subprocess.run(["systemctl", "is-enabled", "rss_monitor"],
+                                                              stdout=subprocess.PIPE,
+                                                              stderr=subprocess.PIPE).returncode == 0
+    _autostart_cache['checked_at'] = time.monotonic()
+    _autostart_cache['enabled'] = enabled
+    return enabled
 
 
 def main_menu():
     """主菜单"""
+    try:
+        import readline  # 为交互输入提供行编辑支持
+    except ImportError:
+        pass
+
     while True:
         os.system('clear' if os.name == 'posix' else 'cls')
         print("NodeSeek论坛网页监控程序")
@@ -1595,27 +2156,10 @@ def main_menu():
 
 
 if __name__ == "__main__":
-    # 检查必要的库是否已安装
-    missing_libraries = []
-    try:
-        import psutil
-    except ImportError:
-        missing_libraries.append("psutil")
-
-    try:
-        import cloudscraper
-    except ImportError:
-        missing_libraries.append("cloudscraper")
-
-    try:
-        from bs4 import BeautifulSoup
-    except ImportError:
-        missing_libraries.append("beautifulsoup4")
-
-    try:
-        import lxml
-    except ImportError:
-        missing_libraries.append("lxml")
+    # 检查必要的库是否已安装（只查找不导入，psutil等仅在用到时才加载）
+    import importlib.util
+    missing_libraries = [lib for lib in ("psutil", "cloudscraper", "cssselect", "lxml")
+                         if importlib.util.find_spec(lib) is None]
 
     # 如果有缺失的库，提示安装
     if missing_libraries:
@@ -1628,8 +2172,6 @@ if __name__ == "__main__":
 
     # 检查是否在Windows系统上
     if os.name == 'nt':  # Windows系统
-        # Windows系统上不使用resource库
-        resource = None
         # 修改PID_FILE路径为Windows兼容
         PID_FILE = os.path.join(BASE_DIR, 'monitor.pid.txt')
         # 警告用户一些功能在Windows上可能不可用